@@ -2,7 +2,6 @@
 Application configuration and settings.
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -13,6 +12,8 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    api_workers: int = 1  # worker processes; ignored while api_reload is on
+    api_reload: bool = True  # auto-reload on code changes (development)
 
     # Logging
     log_level: str = "INFO"
@@ -6,12 +6,16 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from contextlib import asynccontextmanager
+from typing import List
 
-from models.schemas import AllocationRequest, AllocationDecision, HealthCheckResponse
+from models.schemas import (
+    AllocationRequest, AllocationDecision, BatchAllocationRequest, HealthCheckResponse
+)
 from services.allocator import TaskAllocator
 from config.settings import settings
 from utils.logger import setup_logging
 
+
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -60,24 +64,19 @@ if settings.enable_cors:
     )
 
 
-@app.get("/", response_model=HealthCheckResponse)
-async def root():
-    """Root endpoint - health check."""
-    return HealthCheckResponse(
-        status="healthy",
-        version=settings.app_version,
-        model_type=settings.model_type
-    )
+# Health payload depends only on static settings, so build it once
+health_response = HealthCheckResponse(
+    status="healthy",
+    version=settings.app_version,
+    model_type=settings.model_type
+)
 
 
+@app.get("/", response_model=HealthCheckResponse)
 @app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
-    """Health check endpoint."""
-    return HealthCheckResponse(
-        status="healthy",
-        version=settings.app_version,
-        model_type=settings.model_type
-    )
+    """Health check endpoint (also served at the root path)."""
+    return health_response
 
 
 @app.post("/allocate_task", response_model=AllocationDecision)
@@ -99,8 +98,8 @@ async def allocate_task(request: AllocationRequest) -> AllocationDecision:
     """
     try:
         logger.info(
-            f"Received allocation request for task {request.task.task_id} "
-            f"at timestamp {request.timestamp}"
+            "Received allocation request for task %s at timestamp %s",
+            request.task.task_id, request.timestamp
         )
 
         # Validate request
@@ -114,8 +113,8 @@ async def allocate_task(request: AllocationRequest) -> AllocationDecision:
         decision = allocator.allocate_task(request)
 
         logger.info(
-            f"Decision for task {request.task.task_id}: "
-            f"{'SUCCESS' if decision.success else 'REJECTED'}"
+            "Decision for task %s: %s",
+            request.task.task_id, "SUCCESS" if decision.success else "REJECTED"
         )
 
         return decision
@@ -123,7 +122,47 @@ async def allocate_task(request: AllocationRequest) -> AllocationDecision:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing allocation request: {str(e)}", exc_info=True)
+        logger.error("Error processing allocation request: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.post("/allocate_tasks", response_model=List[AllocationDecision])
+async def allocate_tasks(request: BatchAllocationRequest) -> List[AllocationDecision]:
+    """
+    Batch allocation endpoint.
+
+    Receives one system state snapshot and all tasks arriving at the same
+    timestamp, and decides them in order in a single call. Each accepted
+    task's resources are deducted before the next task is placed.
+
+    Args:
+        request: BatchAllocationRequest containing cells status and tasks
+
+    Returns:
+        One AllocationDecision per task, in request order
+
+    Raises:
+        HTTPException: If request processing fails
+    """
+    try:
+        logger.info(
+            "Received batch allocation request for %d tasks at timestamp %s",
+            len(request.tasks), request.timestamp
+        )
+
+        # Validate request
+        if not request.cells:
+            raise HTTPException(
+                status_code=400,
+                detail="Request must contain at least one cell"
+            )
+
+        return allocator.allocate_tasks(request)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error processing batch allocation request: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
@@ -141,7 +180,7 @@ async def get_statistics():
             "statistics": stats
         }
     except Exception as e:
-        logger.error(f"Error retrieving statistics: {str(e)}")
+        logger.error("Error retrieving statistics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -149,12 +188,11 @@ async def get_statistics():
 async def reset_statistics():
     """Reset allocation statistics."""
     try:
-        global allocator
-        allocator = TaskAllocator()
+        allocator.reset_statistics()
         logger.info("Statistics reset")
         return {"status": "success", "message": "Statistics reset"}
     except Exception as e:
-        logger.error(f"Error resetting statistics: {str(e)}")
+        logger.error("Error resetting statistics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -165,6 +203,7 @@ if __name__ == "__main__":
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=True,  # Enable auto-reload during development
+        reload=settings.api_reload,
+        workers=settings.api_workers,
         log_level=settings.log_level.lower()
     )
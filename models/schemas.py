@@ -2,8 +2,8 @@
 Pydantic models for request/response validation.
 Defines the data structures for communication between C++ simulator and ML service.
 """
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Dict
+from pydantic import BaseModel, Field
 
 
 class HardwareType(BaseModel):
@@ -88,6 +88,13 @@ class AllocationRequest(BaseModel):
         }
 
 
+class BatchAllocationRequest(BaseModel):
+    """Request for allocation decisions for several tasks sharing one system snapshot."""
+    timestamp: float = Field(..., description="Current simulation timestamp")
+    cells: List[CellStatus] = Field(..., description="Status of all cells")
+    tasks: List[TaskRequirements] = Field(..., description="Tasks to be allocated, in arrival order")
+
+
 class AllocationDecision(BaseModel):
     """Response containing the allocation decision."""
     success: bool = Field(..., description="Whether allocation is possible")
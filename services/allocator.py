@@ -2,14 +2,32 @@
 Core allocation service implementing the smart allocation algorithm.
 Starts with a simple heuristic approach optimizing for energy efficiency.
 """
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 import logging
-from models.schemas import AllocationRequest, AllocationDecision, CellStatus, HardwareType
+from models.schemas import (
+    AllocationRequest, AllocationDecision, BatchAllocationRequest, CellStatus,
+    HardwareType, TaskRequirements
+)
 from services.energy_calculator import EnergyCalculator
+from config.settings import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Reported in every AllocationDecision produced by this allocator
+ALLOCATION_METHOD = "heuristic_energy_aware"
+
+# Expected CPU utilization used for energy estimates (HPC tasks run hot)
+ASSUMED_CPU_UTILIZATION = 0.8
+
+# Accelerator each implementation needs, matched against the HW type name
+# (implementation 1 is CPU-only and runs on any hardware)
+CPU_IMPLEMENTATION_ID = 1
+IMPLEMENTATION_ACCELERATORS = {2: "GPU", 3: "DFE", 4: "MIC"}
+
+# Availability keys, in the order returned by TaskAllocator._task_demand
+RESOURCE_KEYS = ("cpu", "memory", "storage", "network", "accelerators")
+
 
 class TaskAllocator:
     """
@@ -35,17 +53,68 @@ class TaskAllocator:
         Returns:
             AllocationDecision with selected cell/server or rejection
         """
+        return self._allocate(request.task, request.cells, request.timestamp)
+
+    def allocate_tasks(self, request: BatchAllocationRequest) -> List[AllocationDecision]:
+        """
+        Allocate several tasks against one shared system snapshot.
+
+        Tasks are decided in order. Each accepted task's demand is deducted
+        from the chosen HW type's availability in a working copy of the
+        snapshot, so later tasks in the batch only see the remaining capacity.
+        The request itself is left untouched. Only available_resources is
+        adjusted; current_utilization keeps the values sent by the caller.
+
+        Args:
+            request: Batch request with system state and tasks in arrival order
+
+        Returns:
+            One AllocationDecision per task, in request order
+        """
+        # Copy the availability maps so reservations never leak into the request
+        cells = [
+            cell.model_copy(update={
+                "available_resources": {
+                    hw_type_id: dict(resources)
+                    for hw_type_id, resources in cell.available_resources.items()
+                }
+            })
+            for cell in request.cells
+        ]
+
+        return [
+            self._allocate(task, cells, request.timestamp, reserve=True)
+            for task in request.tasks
+        ]
+
+    def _allocate(
+        self, 
+        task: TaskRequirements, 
+        cells: List[CellStatus], 
+        timestamp: float,
+        reserve: bool = False
+    ) -> AllocationDecision:
+        """
+        Decide placement for a single task and update statistics.
+
+        With reserve=True, an accepted task's demand is deducted from the
+        chosen HW type's availability in the given cells.
+        """
         self.allocation_count += 1
 
         try:
+            demand = self._task_demand(task)
+
             # Find best allocation using energy-aware heuristic
-            allocation = self._heuristic_energy_aware_allocation(request)
+            allocation = self._heuristic_energy_aware_allocation(task, cells, demand)
 
             if allocation:
-                cell_id, hw_type_id, energy_cost, reason = allocation
+                cell_id, hw_type_id, energy_cost, reason, available = allocation
+                if reserve:
+                    self._reserve(demand, available)
                 logger.info(
-                    f"Task {request.task.task_id} allocated to Cell {cell_id}, "
-                    f"HW Type {hw_type_id}, Est. Energy: {energy_cost:.4f} kWh"
+                    "Task %s allocated to Cell %s, HW Type %s, Est. Energy: %.4f kWh",
+                    task.task_id, cell_id, hw_type_id, energy_cost
                 )
                 return AllocationDecision(
                     success=True,
@@ -53,32 +122,34 @@ class TaskAllocator:
                     hw_type_id=hw_type_id,
                     estimated_energy_cost=energy_cost,
                     reason=reason,
-                    allocation_method="heuristic_energy_aware",
-                    timestamp=request.timestamp
+                    allocation_method=ALLOCATION_METHOD,
+                    timestamp=timestamp
                 )
             else:
                 self.rejection_count += 1
-                logger.warning(f"Task {request.task.task_id} rejected - no suitable resources")
+                logger.warning("Task %s rejected - no suitable resources", task.task_id)
                 return AllocationDecision(
                     success=False,
                     reason="No suitable resources available in any cell",
-                    allocation_method="heuristic_energy_aware",
-                    timestamp=request.timestamp
+                    allocation_method=ALLOCATION_METHOD,
+                    timestamp=timestamp
                 )
 
         except Exception as e:
-            logger.error(f"Error allocating task {request.task.task_id}: {str(e)}")
+            logger.error("Error allocating task %s: %s", task.task_id, e)
             return AllocationDecision(
                 success=False,
                 reason=f"Internal error: {str(e)}",
-                allocation_method="heuristic_energy_aware",
-                timestamp=request.timestamp
+                allocation_method=ALLOCATION_METHOD,
+                timestamp=timestamp
             )
 
     def _heuristic_energy_aware_allocation(
         self, 
-        request: AllocationRequest
-    ) -> Optional[Tuple[int, int, float, str]]:
+        task: TaskRequirements, 
+        cells: List[CellStatus],
+        demand: Tuple[float, float, float, float, int]
+    ) -> Optional[Tuple[int, int, float, str, Dict[str, float]]]:
         """
         Heuristic allocation optimizing for energy efficiency.
 
@@ -88,54 +159,73 @@ class TaskAllocator:
         3. Select the one with lowest energy cost
 
         Args:
-            request: Allocation request
+            task: Task to be allocated
+            cells: Status of all cells
+            demand: Total task demand, as returned by _task_demand
 
         Returns:
-            Tuple of (cell_id, hw_type_id, energy_cost, reason) or None if no allocation
+            Tuple of (cell_id, hw_type_id, energy_cost, reason, available) or
+            None if no allocation, where available is the chosen HW type's
+            availability dict in the chosen cell
         """
-        task = request.task
-        candidates = []
+        # Resolve the implementation's hardware needs once per request
+        if task.implementation_id == CPU_IMPLEMENTATION_ID:
+            accelerator = None
+        elif task.implementation_id in IMPLEMENTATION_ACCELERATORS:
+            accelerator = IMPLEMENTATION_ACCELERATORS[task.implementation_id]
+        else:
+            # Unknown implementation cannot run on any hardware
+            return None
+
+        # Use estimated task duration or the configured default
+        duration = task.estimated_duration
+        if not duration:
+            duration = settings.default_task_duration
+
+        best = None
 
         # Iterate through all cells and hardware types
-        for cell in request.cells:
+        for cell in cells:
+            available_resources = cell.available_resources
             for hw_type in cell.hw_types:
+                # Skip HW types the cell reports no availability for
+                available = available_resources.get(hw_type.hw_type_id)
+                if available is None:
+                    continue
+
                 # Check if this HW type matches task requirements
-                if not self._is_compatible(task, hw_type):
+                if not self._is_compatible(accelerator, hw_type):
                     continue
 
                 # Check resource availability
-                if not self._has_sufficient_resources(task, hw_type, cell):
+                if not self._has_sufficient_resources(demand, available):
                     continue
 
                 # Estimate energy cost for this allocation
-                energy_cost = self._estimate_energy_cost(task, hw_type, cell)
+                energy_cost = self._estimate_energy_cost(task, demand, duration, hw_type)
 
                 # Calculate efficiency score (prefer less utilized servers for energy savings)
-                efficiency = self._calculate_efficiency_score(hw_type, cell)
-
-                candidates.append({
-                    'cell_id': cell.cell_id,
-                    'hw_type_id': hw_type.hw_type_id,
-                    'hw_type_name': hw_type.hw_type_name,
-                    'energy_cost': energy_cost,
-                    'efficiency': efficiency,
-                    'score': energy_cost * (2.0 - efficiency)  # Lower is better
-                })
-
-        if not candidates:
+                efficiency = self._calculate_efficiency_score(hw_type, available)
+
+                # Keep the candidate with the lowest score (best energy
+                # efficiency); ties go to the first candidate seen
+                score = energy_cost * (2.0 - efficiency)
+                if best is None or score < best[0]:
+                    best = (score, cell.cell_id, hw_type, energy_cost, available)
+
+        if best is None:
             return None
 
-        # Select candidate with lowest score (best energy efficiency)
-        best = min(candidates, key=lambda x: x['score'])
+        _, cell_id, hw_type, energy_cost, available = best
 
         reason = (
-            f"Selected {best['hw_type_name']} in Cell {best['cell_id']} "
-            f"for optimal energy efficiency (Est: {best['energy_cost']:.4f} kWh)"
+            f"Selected {hw_type.hw_type_name} in Cell {cell_id} "
+            f"for optimal energy efficiency (Est: {energy_cost:.4f} kWh)"
         )
 
-        return (best['cell_id'], best['hw_type_id'], best['energy_cost'], reason)
+        return (cell_id, hw_type.hw_type_id, energy_cost, reason, available)
 
-    def _is_compatible(self, task, hw_type: HardwareType) -> bool:
+    def _is_compatible(self, accelerator: Optional[str], hw_type: HardwareType) -> bool:
         """
         Check if hardware type is compatible with task implementation.
 
@@ -144,73 +234,80 @@ class TaskAllocator:
         2 = GPU (needs CPU+GPU)
         3 = DFE (needs CPU+DFE)
         4 = MIC (needs CPU+MIC)
+
+        Args:
+            accelerator: Accelerator the implementation needs, or None for CPU-only
+            hw_type: Candidate hardware type
         """
-        if task.implementation_id == 1:
+        if accelerator is None:
             # CPU-only tasks can run on any hardware
             return True
-        elif task.implementation_id == 2:
-            # GPU tasks need GPU accelerators
-            return hw_type.accelerators > 0 and "GPU" in hw_type.hw_type_name.upper()
-        elif task.implementation_id == 3:
-            # DFE tasks need DFE accelerators
-            return hw_type.accelerators > 0 and "DFE" in hw_type.hw_type_name.upper()
-        elif task.implementation_id == 4:
-            # MIC tasks need MIC accelerators
-            return hw_type.accelerators > 0 and "MIC" in hw_type.hw_type_name.upper()
-        return False
+        # Accelerated tasks need a HW type carrying that accelerator
+        return hw_type.accelerators > 0 and accelerator in hw_type.hw_type_name.upper()
+
+    @staticmethod
+    def _task_demand(task) -> Tuple[float, float, float, float, int]:
+        """
+        Calculate total resource requirements of a task across all its VMs.
+
+        Computed once per request and shared by every candidate check.
+
+        Returns:
+            Tuple of (cpus, memory, storage, network, accelerators)
+        """
+        num_vms = task.num_vms
+        return (
+            num_vms * task.vcpus_per_vm,
+            num_vms * task.memory_per_vm,
+            num_vms * task.storage_per_vm,
+            num_vms * task.network_per_vm,
+            num_vms if task.requires_accelerator else 0
+        )
+
+    @staticmethod
+    def _reserve(
+        demand: Tuple[float, float, float, float, int], 
+        available: Dict[str, float]
+    ) -> None:
+        """
+        Deduct an accepted task's demand from a HW type's available resources.
+
+        Modifies the availability dict in place; callers pass a working copy.
+        """
+        for resource, amount in zip(RESOURCE_KEYS, demand):
+            if amount:
+                available[resource] = available.get(resource, 0) - amount
 
     def _has_sufficient_resources(
         self, 
-        task, 
-        hw_type: HardwareType, 
-        cell: CellStatus
+        demand: Tuple[float, float, float, float, int], 
+        available: Dict[str, float]
     ) -> bool:
-        """Check if sufficient resources are available."""
-        hw_id = hw_type.hw_type_id
-
-        if hw_id not in cell.available_resources:
-            return False
-
-        available = cell.available_resources[hw_id]
-
-        # Calculate total resource requirements
-        total_cpus_needed = task.num_vms * task.vcpus_per_vm
-        total_memory_needed = task.num_vms * task.memory_per_vm
-        total_storage_needed = task.num_vms * task.storage_per_vm
-        total_network_needed = task.num_vms * task.network_per_vm
-        total_accelerators_needed = task.num_vms if task.requires_accelerator else 0
-
-        # Check each resource
-        checks = [
-            available.get('cpu', 0) >= total_cpus_needed,
-            available.get('memory', 0) >= total_memory_needed,
-            available.get('storage', 0) >= total_storage_needed,
-            available.get('network', 0) >= total_network_needed,
-        ]
-
-        if task.requires_accelerator:
-            checks.append(available.get('accelerators', 0) >= total_accelerators_needed)
-
-        return all(checks)
+        """Check if a HW type's available resources cover the task demand."""
+        cpus, memory, storage, network, accelerators = demand
+
+        # Check each resource in a single expression (no intermediate list)
+        return (
+            available.get('cpu', 0) >= cpus
+            and available.get('memory', 0) >= memory
+            and available.get('storage', 0) >= storage
+            and available.get('network', 0) >= network
+            and (not accelerators or available.get('accelerators', 0) >= accelerators)
+        )
 
     def _estimate_energy_cost(
         self, 
         task, 
-        hw_type: HardwareType, 
-        cell: CellStatus
+        demand: Tuple[float, float, float, float, int], 
+        duration: float, 
+        hw_type: HardwareType
     ) -> float:
         """Estimate energy cost for running task on this hardware."""
-        # Use estimated task duration or default
-        duration = task.estimated_duration if task.estimated_duration else 3600.0  # 1 hour default
-
-        # Estimate CPU utilization (assume high utilization for HPC tasks)
-        cpu_utilization = 0.8
-
         # Calculate energy using the energy calculator
         energy = self.energy_calc.estimate_task_energy(
-            task_vcpus=task.num_vms * task.vcpus_per_vm,
+            task_vcpus=demand[0],
             task_duration=duration,
-            cpu_utilization=cpu_utilization,
+            cpu_utilization=ASSUMED_CPU_UTILIZATION,
             utilization_bins=hw_type.cpu_utilization_bins,
             power_values=hw_type.cpu_power_consumption,
             has_accelerator=task.requires_accelerator,
@@ -224,16 +321,9 @@ class TaskAllocator:
     def _calculate_efficiency_score(
         self, 
         hw_type: HardwareType, 
-        cell: CellStatus
+        available: Dict[str, float]
     ) -> float:
         """Calculate efficiency score for this hardware type in the cell."""
-        hw_id = hw_type.hw_type_id
-
-        if hw_id not in cell.available_resources:
-            return 0.0
-
-        available = cell.available_resources[hw_id]
-
         # Calculate total resources for this HW type
         total_cpus = hw_type.num_servers * hw_type.num_cpus_per_server
         total_memory = hw_type.num_servers * hw_type.memory_per_server
@@ -248,6 +338,11 @@ class TaskAllocator:
             total_accelerators=total_accelerators
         )
 
+    def reset_statistics(self) -> None:
+        """Reset allocator statistics in place."""
+        self.allocation_count = 0
+        self.rejection_count = 0
+
     def get_statistics(self) -> dict:
         """Get allocator statistics."""
         return {
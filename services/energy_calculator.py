@@ -2,8 +2,8 @@
 Energy calculation utilities for estimating power consumption.
 Based on server power profiles and utilization levels.
 """
-from typing import List, Dict
-import numpy as np
+import bisect
+from typing import List
 
 
 class EnergyCalculator:
@@ -35,8 +35,21 @@ class EnergyCalculator:
         # Clamp utilization to valid range
         utilization = max(0.0, min(1.0, utilization))
 
-        # Use numpy for efficient interpolation
-        return float(np.interp(utilization, utilization_bins, power_values))
+        # Linear interpolation matching numpy.interp: values outside the bins
+        # clamp to the end points
+        if len(utilization_bins) != len(power_values):
+            raise ValueError("utilization_bins and power_values must have the same length")
+
+        if utilization <= utilization_bins[0]:
+            return float(power_values[0])
+        if utilization >= utilization_bins[-1]:
+            return float(power_values[-1])
+
+        # Bins are increasing, so a binary search finds the enclosing interval
+        idx = bisect.bisect_right(utilization_bins, utilization)
+        x0, x1 = utilization_bins[idx - 1], utilization_bins[idx]
+        y0, y1 = power_values[idx - 1], power_values[idx]
+        return float(y0 + (y1 - y0) * (utilization - x0) / (x1 - x0))
 
     @staticmethod
     def estimate_task_energy(
@@ -117,17 +130,15 @@ class EnergyCalculator:
         cpu_available_ratio = available_cpus / max(total_cpus, 1)
         memory_available_ratio = available_memory / max(total_memory, 1)
 
-        # Weight CPU and memory equally
-        base_score = (cpu_available_ratio + memory_available_ratio) / 2.0
-
         # Adjust for accelerator availability if relevant
         if total_accelerators > 0:
             accel_available_ratio = available_accelerators / total_accelerators
             # Weighted average: 40% CPU, 40% memory, 20% accelerator
-            base_score = (
-                0.4 * cpu_available_ratio + 
-                0.4 * memory_available_ratio + 
+            return (
+                0.4 * cpu_available_ratio +
+                0.4 * memory_available_ratio +
                 0.2 * accel_available_ratio
             )
 
-        return base_score
+        # Weight CPU and memory equally
+        return (cpu_available_ratio + memory_available_ratio) / 2.0
@@ -4,7 +4,7 @@ Demonstrates how to send allocation requests from Python.
 """
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class AllocationClient:
@@ -39,6 +39,24 @@ class AllocationClient:
         response.raise_for_status()
         return response.json()
 
+    def allocate_tasks(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Request allocation of several tasks sharing one system snapshot.
+
+        Args:
+            request_data: Batch allocation request dictionary
+
+        Returns:
+            List of allocation decision dictionaries, in task order
+        """
+        response = self.session.post(
+            f"{self.base_url}/allocate_tasks",
+            json=request_data,
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        return response.json()
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get allocation statistics."""
         response = self.session.get(f"{self.base_url}/statistics")
@@ -177,8 +195,30 @@ def main():
         print(f"   ✗ Allocation request failed: {e}")
         return
 
-    # 3. Get statistics
-    print("\n3. Retrieving statistics...")
+    # 3. Test batch allocation: each accepted task reduces the capacity seen
+    # by the next one, so the last copy no longer fits (network 20.0 per HW type)
+    print("\n3. Sending batch allocation request...")
+    batch = create_example_request()
+    large_task = dict(batch.pop("task"), num_vms=5000)
+    batch["tasks"] = [
+        dict(large_task, task_id=f"task_batch_{i:03d}") for i in range(1, 4)
+    ]
+
+    try:
+        decisions = client.allocate_tasks(batch)
+        print(f"   ✓ Batch decisions received:")
+        for task, decision in zip(batch["tasks"], decisions):
+            if decision['success']:
+                print(f"     {task['task_id']}: Cell {decision['cell_id']}, "
+                      f"HW Type {decision['hw_type_id']}")
+            else:
+                print(f"     {task['task_id']}: rejected ({decision['reason']})")
+    except Exception as e:
+        print(f"   ✗ Batch allocation request failed: {e}")
+        return
+
+    # 4. Get statistics
+    print("\n4. Retrieving statistics...")
     try:
         stats = client.get_statistics()
         print(f"   ✓ Statistics:")